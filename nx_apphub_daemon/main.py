@@ -4,17 +4,46 @@
 
 import os
 import shutil
+import signal
+import stat
 import subprocess
 import time
 import logging
 import re
-import configparser
 import threading
 import errno
+import functools
+import itertools
+import json
+import queue
+import random
+import tempfile
+import atexit
 import yaml
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (
+    PatternMatchingEventHandler,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileMovedEvent,
+    FileClosedEvent,
+)
+
+# The libyaml-backed loader parses much faster where PyYAML was built with it.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    from jeepney import DBusAddress, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:
+    open_dbus_connection = None
 
 # <---
 # --->
@@ -31,20 +60,125 @@ icons_dir = xdg_data_home / "icons" / "nx-apphub"
 config_dir = xdg_config_home / "nx-apphub"
 alias_file = config_dir / "aliases.zsh"
 
+# String forms for hot-path checks that do not need Path objects.
+apps_dir_str = str(apps_dir)
+watch_prefix = str(watch_dir) + os.sep
+
+# Event paths are filtered by slicing off the fixed AppBox suffix.
+appbox_suffix = ".AppBox"
+appbox_suffix_start = -len(appbox_suffix)
+integration_cache_file = extract_dir / "integrated.json"
+desktop_exec_cache_file = extract_dir / "desktop-exec.json"
+zshrc_marker_file = extract_dir / "zshrc-sourced"
+
+# Icon locations probed directly, largest sizes first, before searching squashfs-root.
+icon_probe_dirs = (
+    "",
+    "usr/share/icons/hicolor/scalable/apps",
+    "usr/share/icons/hicolor/512x512/apps",
+    "usr/share/icons/hicolor/256x256/apps",
+    "usr/share/icons/hicolor/128x128/apps",
+    "usr/share/icons/hicolor/64x64/apps",
+    "usr/share/icons/hicolor/48x48/apps",
+    "usr/share/pixmaps",
+)
+
+# Image formats accepted as application icons, in order of preference.
+icon_suffixes = (".png", ".svg", ".xpm")
+icon_suffix_set = frozenset(icon_suffixes)
+
+# Poll for readiness even when inotify reported the file as closed; close
+# events are not delivered for writes made by other hosts (NFS, CIFS).
+force_ready_poll = os.environ.get("NX_APPHUBD_FORCE_POLL", "") not in ("", "0")
+
+# AppBox architecture names for the Debian architectures used in app.yml.
+appbox_arch_names = {"amd64": "x86_64", "arm64": "aarch64"}
+cli_arch_names = {v: k for k, v in appbox_arch_names.items()}
+
+# Filesystems on which inotify misses changes, watched by polling instead.
+polled_filesystems = frozenset({"nfs", "nfs4", "cifs", "smbfs", "smb3", "overlay", "fuse.sshfs"})
+
+# Initial interval in seconds between checks while waiting for an AppBox
+# to finish being written; slow disks may need a larger value.
+try:
+    poll_interval = max(0.05, float(os.environ.get("NX_APPHUBD_POLL_INTERVAL", 0.5)))
+except ValueError:
+    poll_interval = 0.5
+
+# Characters replaced by sanitize_name, and patterns used to derive
+# application names from AppBox file names.
+sanitize_table = str.maketrans(":+~", "---")
+version_suffix_re = re.compile(r'-[^-]+$')
+digit_re = re.compile(r'\d')
+
+# Extracts the quoted AppBox path from an alias line.
+alias_target_re = re.compile(r"='([^']+)'")
+
+# Octal escapes (\040 for a space, ...) used in /proc/self/mountinfo paths.
+mountinfo_escape_re = re.compile(r'\\([0-7]{3})')
+
+# Classifies a desktop file line as a group header or a key=value entry.
+desktop_line_re = re.compile(rb"\s*(?:\[(?P<group>[^\]]*)\]|(?P<key>[A-Za-z0-9-]+(?:\[[^\]]+\])?)\s*=(?P<value>.*))")
+
 file_lock = threading.Lock()
+cache_lock = threading.Lock()
+
+# Integration cache entries, loaded from integration_cache_file on first use.
+integration_cache = {"entries": None}
+
+# Contents of the alias file as last read or written, and its mtime then.
+alias_cache = {"text": None, "mtime_ns": None}
+
+# Parsed app.yml buildinfo keyed by path, and per-architecture indexes of it
+# by application name.
+yaml_lock = threading.Lock()
+buildinfo_cache = {}
+yaml_index = {}
+
+trash_counter = itertools.count()
+
+# Runs every integration, from the startup scan and from file events alike,
+# so no more than a few extractions compete for the disk at once.
+integrator_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="Integrator")
+
+# Resolved once; PATH does not change during the daemon's lifetime.
+notify_send = shutil.which("notify-send")
+unsquashfs = shutil.which("unsquashfs")
+
+notify_lock = threading.Lock()
+# Session bus connection for notifications, opened on first use.
+notification_bus = {"connection": None}
+notification_hints = {"urgency": ("y", 1)}
+notifications_address = DBusAddress(
+    "/org/freedesktop/Notifications",
+    bus_name="org.freedesktop.Notifications",
+    interface="org.freedesktop.Notifications"
+) if open_dbus_connection is not None else None
 
 
 # -- Use a log file.
 
 log_file = home / ".nx-apphubd.log"
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(threadName)s: %(message)s"
-)
+# Records are handed to a queue and written by a listener thread, so
+# integration threads never block on the log file.
+log_handler = logging.FileHandler(log_file)
+log_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(threadName)s: %(message)s"))
+
+log_queue = queue.Queue()
+log_listener = QueueListener(log_queue, log_handler)
+
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(QueueHandler(log_queue))
 
+log = logging.getLogger(__name__)
 
+log_listener.start()
+atexit.register(log_listener.stop)
+
+
+@functools.lru_cache(maxsize=1024)
 def sanitize_name(name: str) -> str:
     """
     Sanitize application name by replacing problematic characters with hyphens.
@@ -55,9 +189,10 @@ def sanitize_name(name: str) -> str:
     Returns:
         The sanitized name with ':+~' characters replaced by '-'.
     """
-    return re.sub(r'[:+~]', '-', name)
+    return name.translate(sanitize_table)
 
 
+@functools.lru_cache(maxsize=1024)
 def get_base_app_name(filename_stem: str) -> str:
     """
     Extract the base application name from an AppBox filename.
@@ -68,14 +203,26 @@ def get_base_app_name(filename_stem: str) -> str:
     Returns:
         The base application name extracted from the filename.
     """
-    filename_stem = re.sub(r'-[^-]+$', '', filename_stem)
-    base_name = filename_stem.split('-')[0]
+    parts = version_suffix_re.sub('', filename_stem).split('-')
 
-    parts = filename_stem.split('-')
-    if len(parts) >= 2 and not re.search(r'\d', parts[1]):
-        base_name = '-'.join(parts[:2])
+    if len(parts) >= 2 and not digit_re.search(parts[1]):
+        return '-'.join(parts[:2])
+
+    return parts[0]
+
+
+@functools.lru_cache(maxsize=256)
+def display_name(name: str) -> str:
+    """
+    Format an application name for notifications.
+
+    Args:
+        name: Sanitized application name.
 
-    return base_name
+    Returns:
+        The name in title case, e.g. 'firefox-esr' becomes 'Firefox-Esr'.
+    """
+    return name.title()
 
 
 def is_elf_binary(path: Path) -> bool:
@@ -89,13 +236,143 @@ def is_elf_binary(path: Path) -> bool:
         True if the file is a valid ELF binary, False otherwise.
     """
     try:
-        with open(path, "rb") as f:
-            return f.read(4) == b'\x7fELF'
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            return os.read(fd, 4) == b'\x7fELF'
+        finally:
+            os.close(fd)
     except Exception as e:
-        logging.error(f"Failed to check file signature for {path}: {e}")
+        log.error("Failed to check file signature for %s: %s", path, e)
         return False
 
 
+def read_buildinfo(yaml_file: Path) -> tuple[str, str] | None:
+    """
+    Read the application name and AppBox architecture from an app.yml.
+
+    Results are cached on the file's mtime and size, so an unchanged
+    definition is parsed only once.
+
+    Args:
+        yaml_file: Path to the app.yml file.
+
+    Returns:
+        A tuple of (name, arch), with arch in AppBox naming (e.g. x86_64),
+        or None if the file cannot be read or has no buildinfo name.
+    """
+    try:
+        st = os.stat(yaml_file)
+    except OSError:
+        return None
+
+    key = str(yaml_file)
+    cached = buildinfo_cache.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    result = None
+
+    try:
+        with open(yaml_file, 'r', encoding='utf-8') as f:
+            yaml_data = yaml.load(f, Loader=YamlLoader)
+
+        if yaml_data and 'buildinfo' in yaml_data:
+            buildinfo = yaml_data['buildinfo']
+            yaml_name = buildinfo.get('name', '')
+
+            yaml_arch = None
+            if 'distrorepo' in buildinfo and buildinfo['distrorepo']:
+                yaml_arch = buildinfo['distrorepo'][0].get('arch', '')
+
+            if yaml_name:
+                result = (yaml_name, appbox_arch_names.get(yaml_arch, yaml_arch))
+    except yaml.YAMLError as e:
+        log.debug("Failed to parse YAML %s: %s", yaml_file, e)
+    except Exception as e:
+        log.debug("Error checking YAML %s: %s", yaml_file, e)
+
+    buildinfo_cache[key] = (st.st_mtime_ns, st.st_size, result)
+
+    return result
+
+
+def _build_yaml_index(nx_apphub_cli_dir: Path, cli_arch: str) -> dict:
+    """
+    Map the application names defined for one architecture to their app.yml files.
+
+    Definitions live at <repo>/apps/<arch>/<appname>/app.yml, so only the
+    subtrees of the requested architecture are visited. The files are read
+    on a short-lived thread pool, so slow storage is read concurrently.
+
+    Must be called with yaml_lock held.
+
+    Args:
+        nx_apphub_cli_dir: The nx-apphub-cli data directory.
+        cli_arch: Architecture directory name used by nx-apphub-cli (e.g. amd64).
+
+    Returns:
+        A dictionary of name -> list of (app.yml path, AppBox arch) tuples.
+    """
+    index = {}
+    yaml_files = [p for p in nx_apphub_cli_dir.glob(f"*/apps/{cli_arch}/*/app.yml") if p.is_file()]
+
+    # A separate pool, since this runs on the integrator pool's own workers.
+    if len(yaml_files) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(yaml_files)), thread_name_prefix="YamlIndex") as pool:
+            buildinfos = list(pool.map(read_buildinfo, yaml_files))
+    else:
+        buildinfos = [read_buildinfo(yaml_file) for yaml_file in yaml_files]
+
+    for yaml_file, buildinfo in zip(yaml_files, buildinfos):
+        if buildinfo:
+            index.setdefault(buildinfo[0], []).append((yaml_file, buildinfo[1]))
+
+    return index
+
+
+def find_yaml_definition(nx_apphub_cli_dir: Path, filename_stem: str, file_arch: str) -> Path | None:
+    """
+    Find the app.yml an AppBox was built from.
+
+    A definition matches when the file name starts with its name followed
+    by '-' and its architecture matches, so any version of an application
+    validates against the same YAML. Candidates are looked up by the
+    '-'-separated prefixes of the file name in an index of all definitions,
+    which is rebuilt when no current entry matches.
+
+    Args:
+        nx_apphub_cli_dir: The nx-apphub-cli data directory.
+        filename_stem: AppBox file name without extension.
+        file_arch: Architecture suffix of the AppBox file name.
+
+    Returns:
+        Path to the matching app.yml, or None if there is none.
+    """
+
+    parts = filename_stem.split('-')
+    names = ['-'.join(parts[:i]) for i in range(1, len(parts))]
+    cli_arch = cli_arch_names.get(file_arch, file_arch)
+
+    with yaml_lock:
+        index = yaml_index.get(cli_arch)
+        fresh = index is None
+        if fresh:
+            index = yaml_index[cli_arch] = _build_yaml_index(nx_apphub_cli_dir, cli_arch)
+
+        while True:
+            for name in names:
+                for yaml_file, yaml_arch in index.get(name, ()):
+                    # Re-checked so an edited or removed definition is not trusted.
+                    if yaml_arch == file_arch and read_buildinfo(yaml_file) == (name, yaml_arch):
+                        return yaml_file
+
+            if fresh:
+                return None
+
+            index = yaml_index[cli_arch] = _build_yaml_index(nx_apphub_cli_dir, cli_arch)
+            fresh = True
+
+
 def is_valid_appbox(path: Path) -> tuple[bool, str]:
     """
     Validate that a file is a genuine AppBox and not a renamed AppImage.
@@ -131,126 +408,143 @@ def is_valid_appbox(path: Path) -> tuple[bool, str]:
     nx_apphub_cli_dir = xdg_data_home / "nx-apphub-cli"
 
     if not nx_apphub_cli_dir.exists():
-        logging.warning(
-            f"nx-apphub-cli directory not found at {nx_apphub_cli_dir}. "
-            f"Cannot validate {path.name} as a genuine AppBox."
+        log.warning(
+            "nx-apphub-cli directory not found at %s. "
+            "Cannot validate %s as a genuine AppBox.",
+            nx_apphub_cli_dir,
+            path.name
         )
         return False, "No nx-apphub-cli directory found - AppBox definitions missing"
 
     filename_stem = path.stem
 
-    arch_mapping = {
-        'x86_64': 'amd64',
-        'aarch64': 'arm64'
-    }
-
     parts = filename_stem.split('-')
     if len(parts) < 3:
         return False, "Invalid AppBox filename format"
 
     file_arch = parts[-1]
 
-    found_yaml = False
-    found_yaml_path = None
+    # Check for build marker - proves the AppBox was built by nx-apphub-cli.
+    # A single stat, so it runs before the YAML lookup.
+    build_markers_dir = nx_apphub_cli_dir / ".built"
+    build_marker_file = build_markers_dir / filename_stem
+
+    if not build_marker_file.exists():
+        log.error(
+            "Build marker not found for %s. "
+            "This AppBox was not built through nx-apphub-cli. "
+            "Expected marker at: %s. "
+            "Integration refused.",
+            path.name,
+            build_marker_file
+        )
+        return False, "No build marker found - AppBox not built by nx-apphub-cli"
 
     try:
-        for yaml_file in nx_apphub_cli_dir.rglob("app.yml"):
-            if not yaml_file.is_file():
-                continue
+        found_yaml_path = find_yaml_definition(nx_apphub_cli_dir, filename_stem, file_arch)
+    except Exception as e:
+        log.error("Error searching for YAML definition for %s: %s", path.name, e)
+        return False, f"Error validating AppBox: {e}"
 
-            try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    yaml_data = yaml.safe_load(f)
+    if found_yaml_path is None:
+        log.error(
+            "No YAML definition found for %s. "
+            "This file may be a renamed AppImage or was not built through nx-apphub-cli. "
+            "nx-apphubd is designed to integrate AppBoxes built from YAML definitions. "
+            "Integration refused.",
+            path.name
+        )
+        return False, "No corresponding YAML definition found - not a valid AppBox"
 
-                if not yaml_data or 'buildinfo' not in yaml_data:
-                    continue
+    log.info("Found matching YAML definition for %s: %s", path.name, found_yaml_path)
 
-                buildinfo = yaml_data['buildinfo']
-                yaml_name = buildinfo.get('name', '')
+    return True, "Valid AppBox"
 
-                if not yaml_name:
-                    continue
 
-                yaml_arch = None
-                if 'distrorepo' in buildinfo and buildinfo['distrorepo']:
-                    yaml_arch = buildinfo['distrorepo'][0].get('arch', '')
-
-                reverse_arch_mapping = {v: k for k, v in arch_mapping.items()}
-                expected_arch = reverse_arch_mapping.get(yaml_arch, yaml_arch)
-
-                # Check if the filename starts with the app name and has matching arch
-                # This allows different versions to be validated against the same YAML
-                if filename_stem.startswith(f"{yaml_name}-") and file_arch == expected_arch:
-                    found_yaml = True
-                    found_yaml_path = yaml_file
-                    logging.info(
-                        f"Found matching YAML definition for {path.name}: {yaml_file}"
-                    )
-                    break
+def _get_notification_bus():
+    """
+    Open the session bus connection used for notifications on first use.
 
-            except yaml.YAMLError as e:
-                logging.debug(f"Failed to parse YAML {yaml_file}: {e}")
-                continue
-            except Exception as e:
-                logging.debug(f"Error checking YAML {yaml_file}: {e}")
-                continue
+    Must be called with notify_lock held.
 
-    except Exception as e:
-        logging.error(f"Error searching for YAML definition for {path.name}: {e}")
-        return False, f"Error validating AppBox: {e}"
+    Returns:
+        The D-Bus connection, or None if the session bus is unavailable.
+    """
+    if notification_bus["connection"] is None and open_dbus_connection is not None:
+        try:
+            notification_bus["connection"] = open_dbus_connection(bus="SESSION")
+        except Exception as e:
+            log.debug("Session bus unavailable for notifications: %s", e)
 
-    if not found_yaml:
-        logging.error(
-            f"No YAML definition found for {path.name}. "
-            "This file may be a renamed AppImage or was not built through nx-apphub-cli. "
-            "nx-apphubd is designed to integrate AppBoxes built from YAML definitions. "
-            "Integration refused."
-        )
-        return False, "No corresponding YAML definition found - not a valid AppBox"
+    return notification_bus["connection"]
 
-    # Check for build marker - proves the AppBox was built by nx-apphub-cli
-    build_markers_dir = nx_apphub_cli_dir / ".built"
-    build_marker_file = build_markers_dir / filename_stem
 
-    if not build_marker_file.exists():
-        logging.error(
-            f"Build marker not found for {path.name}. "
-            "This AppBox was not built through nx-apphub-cli. "
-            f"Expected marker at: {build_marker_file}. "
-            "Integration refused."
+def _notify_dbus(summary: str, body: str, icon_name: str) -> bool:
+    """
+    Send a notification through org.freedesktop.Notifications over D-Bus.
+
+    Args:
+        summary: Notification title.
+        body: Notification message body.
+        icon_name: Icon path or icon name for the notification.
+
+    Returns:
+        True if the notification server accepted the notification.
+    """
+    with notify_lock:
+        bus = _get_notification_bus()
+        if bus is None:
+            return False
+
+        message = new_method_call(
+            notifications_address, "Notify", "susssasa{sv}i",
+            ("NX AppHub", 0, icon_name, summary, body, [], notification_hints, -1)
         )
-        return False, "No build marker found - AppBox not built by nx-apphub-cli"
 
-    return True, "Valid AppBox"
+        try:
+            bus.send_and_get_reply(message, timeout=5)
+            return True
+        except Exception as e:
+            log.debug("D-Bus notification failed, falling back to notify-send: %s", e)
+            bus.close()
+            notification_bus["connection"] = None
+            return False
 
 
 def send_notification(summary: str, body: str, icon: Path = None):
     """
-    Send a desktop notification using notify-send.
+    Send a desktop notification.
+
+    Notifications go directly to org.freedesktop.Notifications over a
+    persistent session bus connection, falling back to notify-send when
+    the bus cannot be reached.
 
     Args:
         summary: Notification title.
         body: Notification message body.
         icon: Optional path to icon file for the notification.
     """
-    if not shutil.which("notify-send"):
+    if icon and icon.exists():
+        icon_name = str(icon)
+    else:
+        # Fallback icon
+        icon_name = "application-x-executable"
+
+    if _notify_dbus(summary, body, icon_name):
+        return
+
+    if not notify_send:
         return
 
     cmd = [
-        "notify-send",
+        notify_send,
         "-a", "NX AppHub",
         "-u", "normal",
+        "-i", icon_name,
+        summary,
+        body,
     ]
 
-    if icon and icon.exists():
-        cmd.extend(["-i", str(icon)])
-    else:
-        # Fallback icon
-        cmd.extend(["-i", "application-x-executable"])
-
-    cmd.append(summary)
-    cmd.append(body)
-
     try:
         subprocess.run(
             cmd,
@@ -259,229 +553,1161 @@ def send_notification(summary: str, body: str, icon: Path = None):
             check=False
         )
     except Exception as e:
-        logging.error(f"Failed to send notification: {e}")
+        log.error("Failed to send notification: %s", e)
 
 
-def update_alias_file(alias_name: str, appbox_path: Path, remove=False):
+def _load_alias_text() -> str:
     """
-    Update the dedicated aliases.zsh file in a thread-safe manner.
+    Return the contents of the alias file, re-reading it only if it changed.
 
-    Args:
-        alias_name: The alias name to add or remove.
-        appbox_path: Path to the AppBox executable.
-        remove: If True, remove the alias; otherwise add it.
-    """
-    with file_lock:
-        config_dir.mkdir(parents=True, exist_ok=True)
+    The text is kept in memory together with the file's mtime, so repeated
+    alias updates do not read the file again unless it was edited outside
+    the daemon. Must be called with file_lock held, or while no other thread
+    can touch the alias file.
 
-        lines = []
-        if alias_file.exists():
-            with open(alias_file, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
+    Returns:
+        The contents of the alias file.
+    """
+    try:
+        mtime_ns = alias_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        alias_cache["text"], alias_cache["mtime_ns"] = "", None
+        return alias_cache["text"]
 
-        alias_cmd = f"alias {alias_name}='{str(appbox_path)}'\n"
-        header = f"# Alias for {alias_name}\n"
+    if alias_cache["text"] is None or mtime_ns != alias_cache["mtime_ns"]:
+        with open(alias_file, "r", encoding="utf-8", errors="ignore") as f:
+            alias_cache["text"] = f.read()
+        alias_cache["mtime_ns"] = mtime_ns
 
-        new_lines = []
-        skip = False
+    return alias_cache["text"]
 
-        for i, line in enumerate(lines):
-            if skip:
-                skip = False
-                continue
 
-            if line.strip() == header.strip():
-                if i + 1 < len(lines) and lines[i+1].strip().startswith(f"alias {alias_name}="):
-                    skip = True
-                    continue
+def _store_alias_text(text: str):
+    """
+    Atomically replace the alias file and remember its new contents.
 
-            new_lines.append(line)
+    Must be called with file_lock held, or while no other thread can touch
+    the alias file.
 
-        if not remove:
-            if new_lines and new_lines[-1].strip() != "":
-                new_lines.append("\n")
-            new_lines.append(header)
-            new_lines.append(alias_cmd)
+    Args:
+        text: New contents of the alias file.
+    """
+    config_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = alias_file.with_name(f".{alias_file.name}.tmp")
 
-        with open(alias_file, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_file, alias_file)
 
-        logging.info(f"{'Removed' if remove else 'Added'} alias for {alias_name} in {alias_file}")
+    alias_cache["text"] = text
+    alias_cache["mtime_ns"] = alias_file.stat().st_mtime_ns
 
 
-def wait_until_file_ready(path: Path, timeout=90, interval=0.2) -> bool:
+def _append_alias_text(text: str):
     """
-    Wait until the file is no longer changing (and not locked).
+    Append to the alias file and to its remembered contents.
 
-    Args:
-        path: Path to the file to monitor.
-        timeout: Maximum time to wait in seconds (default: 90).
-        interval: Time between checks in seconds (default: 0.2).
+    Must be called with file_lock held, after _load_alias_text.
 
-    Returns:
-        True if file is ready and accessible, False if timeout occurs.
+    Args:
+        text: Text to append.
     """
-    start_time = time.time()
-    last_size = -1
+    config_dir.mkdir(parents=True, exist_ok=True)
 
-    while time.time() - start_time < timeout:
-        try:
-            current_size = path.stat().st_size
-            if current_size == last_size and os.access(path, os.R_OK):
-                return True
-            last_size = current_size
-        except (FileNotFoundError, PermissionError):
-            pass
-        time.sleep(interval)
+    with open(alias_file, "a", encoding="utf-8") as f:
+        f.write(text)
 
-    return False
+    alias_cache["text"] += text
+    alias_cache["mtime_ns"] = alias_file.stat().st_mtime_ns
 
 
-def integrate_appbox(appbox_path: Path):
+def update_alias_file(alias_name: str, appbox_path: Path, remove=False):
     """
-    Main integration logic for AppBox files. Designed to run in a separate thread.
+    Update the dedicated aliases.zsh file in a thread-safe manner.
 
-    Extracts the AppBox, parses the desktop file, installs icons, and creates
-    desktop integration. Handles CLI applications by creating shell aliases.
+    Any existing block for the alias is spliced out with a single regex
+    substitution. The file is only written when its contents actually
+    change, and a new alias is appended rather than rewriting the file.
 
     Args:
-        appbox_path: Path to the AppBox file to integrate.
+        alias_name: The alias name to add or remove.
+        appbox_path: Path to the AppBox executable.
+        remove: If True, remove the alias; otherwise add it.
     """
-    extract_dir.mkdir(parents=True, exist_ok=True)
+    with file_lock:
+        text = _load_alias_text()
 
-    if not wait_until_file_ready(appbox_path):
-        logging.warning(f"AppBox not ready after timeout: {appbox_path}")
-        return
+        block = f"# Alias for {alias_name}\nalias {alias_name}='{str(appbox_path)}'\n"
 
-    is_valid, validation_reason = is_valid_appbox(appbox_path)
-    if not is_valid:
-        logging.error(
-            f"AppBox validation failed for {appbox_path.name}: {validation_reason}. "
-            "Skipping integration."
-        )
-        send_notification(
-            "Integration Failed",
-            f"{appbox_path.name} could not be integrated. {validation_reason}."
-        )
-        return
+        if not remove and (text.startswith(block) or f"\n{block}" in text):
+            return
 
-    if not os.access(appbox_path, os.X_OK):
-        logging.warning(f"{appbox_path.name} is not executable; setting mode 755")
-        appbox_path.chmod(0o755)
+        name = re.escape(alias_name)
+        block_re = re.compile(rf"^[ \t]*# Alias for {name}[ \t]*\r?\n[ \t]*alias {name}=.*(?:\n|\Z)", re.M)
+        new_text, replaced = block_re.subn("", text)
 
-    raw_base_name = get_base_app_name(appbox_path.stem)
-    sanitized_name = sanitize_name(raw_base_name)
+        if not remove:
+            last_line = new_text[new_text.rfind("\n", 0, len(new_text) - 1) + 1:]
+            if last_line.strip():
+                block = "\n" + block
 
-    desktop_file_path = apps_dir / f"{sanitized_name}.desktop"
+            # A new alias only needs appending; rewrite only to replace an old one.
+            if not replaced:
+                _append_alias_text(block)
+                log.info("Added alias for %s in %s", alias_name, alias_file)
+                return
 
-    if desktop_file_path.exists():
-        logging.info(f"AppBox {appbox_path.name} already integrated as {desktop_file_path.name}")
-        return
+            new_text += block
 
-    specific_extract_dir = extract_dir / f"{sanitize_name(appbox_path.stem)}"
-    specific_extract_dir.mkdir(parents=True, exist_ok=True)
+        if not replaced:
+            return
 
-    logging.info(f"Extracting {appbox_path.name}...")
+        _store_alias_text(new_text)
 
-    max_retries = 5
-    extraction_success = False
+        log.info("%s alias for %s in %s", "Removed" if remove else "Added", alias_name, alias_file)
 
-    for attempt in range(max_retries):
-        try:
-            subprocess.run(
-                [str(appbox_path), "--appimage-extract"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-                cwd=specific_extract_dir
-            )
-            extraction_success = True
-            break
-        except OSError as e:
-            if e.errno == errno.ETXTBSY:
-                logging.warning(f"File {appbox_path.name} is busy (ETXTBSY), retrying extraction in 1s (Attempt {attempt + 1}/{max_retries})...")
-                time.sleep(1.0)
-            else:
-                logging.error(f"OSError during extraction of {appbox_path}: {e}")
-                break
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Extraction command failed for {appbox_path}: {e}")
-            break
 
-    if not extraction_success:
-        logging.error(f"Failed to extract {appbox_path} after retries.")
-        shutil.rmtree(specific_extract_dir, ignore_errors=True)
-        return
+def _load_integration_cache() -> dict:
+    """
+    Load the integration cache from disk on first use.
 
-    squashfs_root = specific_extract_dir / "squashfs-root"
+    The cache maps AppBox paths to the size and mtime they had when they
+    were integrated, along with the desktop file that was written for them.
+    Must be called with cache_lock held.
 
-    extracted_desktop_file = None
-    for root, _, files in os.walk(squashfs_root):
-        for file in files:
-            if file.endswith(".desktop"):
-                extracted_desktop_file = Path(root) / file
-                break
-        if extracted_desktop_file:
-            break
+    Returns:
+        The integration cache dictionary.
+    """
+    if integration_cache["entries"] is None:
+        try:
+            with open(integration_cache_file, "r", encoding="utf-8") as f:
+                integration_cache["entries"] = json.load(f)
+        except (OSError, ValueError):
+            integration_cache["entries"] = {}
 
-    if not extracted_desktop_file:
-        logging.warning(f"No desktop file found in {appbox_path}")
-        shutil.rmtree(specific_extract_dir, ignore_errors=True)
-        return
+    return integration_cache["entries"]
 
-    icon_file = None
-    for root, _, files in os.walk(squashfs_root):
-        for file in files:
-            if file.lower().endswith((".png", ".svg", ".xpm")):
-                icon_file = Path(root) / file
-                break
-        if icon_file:
-            break
 
-    icon_dest = None
-    if icon_file:
-        icon_dest = icons_dir / f"{sanitized_name}{icon_file.suffix}"
-        icons_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copy(icon_file, icon_dest)
+def _save_integration_cache():
+    """
+    Write the integration cache back to disk. Must be called with cache_lock held.
 
-    parser = configparser.ConfigParser()
-    parser.optionxform = str
+    The cache is written to a temporary file that replaces the old one, so
+    a crash mid-write never leaves a truncated cache behind.
+    """
+    tmp_file = integration_cache_file.with_name(f".{integration_cache_file.name}.{os.getpid()}")
 
     try:
-        parser.read(extracted_desktop_file, encoding='utf-8')
-    except configparser.Error as e:
-        logging.error(f"Error parsing desktop file for {appbox_path}: {e}")
-        shutil.rmtree(specific_extract_dir, ignore_errors=True)
-        return
-
-    if 'Desktop Entry' not in parser:
-        logging.warning(f"Invalid desktop file (no [Desktop Entry]): {extracted_desktop_file}")
-        shutil.rmtree(specific_extract_dir, ignore_errors=True)
-        return
-
-    parser['Desktop Entry']['Exec'] = str(appbox_path)
-    parser['Desktop Entry']['TryExec'] = str(appbox_path)
-    if icon_dest:
-        parser['Desktop Entry']['Icon'] = str(icon_dest)
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(integration_cache["entries"], f)
+        os.replace(tmp_file, integration_cache_file)
+    except OSError as e:
+        log.error("Failed to write integration cache %s: %s", integration_cache_file, e)
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
 
-    is_cli_app = parser['Desktop Entry'].get('NoDisplay', 'false').lower() == 'true'
 
-    apps_dir.mkdir(parents=True, exist_ok=True)
-    with open(desktop_file_path, "w", encoding="utf-8") as f:
-        parser.write(f, space_around_delimiters=False)
+def _load_desktop_exec_cache() -> dict:
+    """
+    Load the Exec= and Icon= values remembered for unindexed desktop files.
 
-    logging.info(f"Integrated {appbox_path.name} as {desktop_file_path.name}")
+    Returns:
+        A dictionary of desktop file path -> [mtime_ns, size, exec, icon].
+    """
+    try:
+        with open(desktop_exec_cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    send_notification(
-        "Application Installed",
-        f"{sanitized_name.title()} has been successfully integrated with the system.",
-        icon=icon_dest
-    )
+    return cache if isinstance(cache, dict) else {}
 
-    if is_cli_app:
-        update_alias_file(sanitized_name, appbox_path, remove=False)
 
-    shutil.rmtree(specific_extract_dir, ignore_errors=True)
+def _save_desktop_exec_cache(cache: dict):
+    """
+    Atomically write the Exec= and Icon= values of unindexed desktop files.
+
+    Args:
+        cache: A dictionary of desktop file path -> [mtime_ns, size, exec, icon].
+    """
+    tmp_file = desktop_exec_cache_file.with_name(f".{desktop_exec_cache_file.name}.{os.getpid()}")
+
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, desktop_exec_cache_file)
+    except OSError as e:
+        log.error("Failed to write desktop entry cache %s: %s", desktop_exec_cache_file, e)
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+
+
+def is_cached_integration(appbox_path: Path) -> bool:
+    """
+    Check whether an AppBox was already integrated in its current state.
+
+    Args:
+        appbox_path: Path to the AppBox file.
+
+    Returns:
+        True if the AppBox size and mtime match the cached integration and the
+        desktop file recorded for it still exists, False otherwise.
+    """
+    try:
+        st = appbox_path.stat()
+    except OSError:
+        return False
+
+    with cache_lock:
+        entry = _load_integration_cache().get(str(appbox_path))
+
+    if not entry or entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+        return False
+
+    return os.path.exists(entry.get("desktop", ""))
+
+
+def record_integration(appbox_path: Path, desktop_file_path: Path, icon_path: Path = None, is_cli: bool = None):
+    """
+    Store a successful integration in the integration cache.
+
+    Besides the AppBox state, the entry records the files that were created
+    for it, and whether it got a shell alias, so they can be removed later
+    without scanning apps_dir or the alias file.
+
+    Args:
+        appbox_path: Path to the integrated AppBox file.
+        desktop_file_path: Path to the desktop file written for it.
+        icon_path: Optional path to the icon installed for it.
+        is_cli: Whether a shell alias was created for it; None if unknown.
+    """
+    record_integrations({appbox_path: (desktop_file_path, icon_path, is_cli)})
+
+
+def record_integrations(integrations: dict):
+    """
+    Store several integrations in the integration cache with a single write.
+
+    Args:
+        integrations: Mapping of AppBox paths to (desktop file, icon or None,
+            is_cli or None) tuples.
+    """
+    entries = {}
+
+    for appbox_path, (desktop_file_path, icon_path, is_cli) in integrations.items():
+        try:
+            st = appbox_path.stat()
+        except OSError:
+            continue
+
+        entries[str(appbox_path)] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "desktop": str(desktop_file_path),
+            "icons": [str(icon_path)] if icon_path else [],
+            "cli": is_cli,
+        }
+
+    if not entries:
+        return
+
+    with cache_lock:
+        _load_integration_cache().update(entries)
+        _save_integration_cache()
+
+
+def forget_integration(appbox_path: Path) -> dict | None:
+    """
+    Drop an AppBox from the integration cache.
+
+    Args:
+        appbox_path: Path to the AppBox file.
+
+    Returns:
+        The removed cache entry, or None if the AppBox was not cached.
+    """
+    with cache_lock:
+        entry = _load_integration_cache().pop(str(appbox_path), None)
+        if entry is not None:
+            _save_integration_cache()
+
+    return entry
+
+
+def wait_until_file_ready(path: Path, timeout=90, interval=None, max_interval=2.0, quiet_period=5.0) -> bool:
+    """
+    Wait until the file is no longer changing (and not locked).
+
+    A file that has not been modified for `quiet_period` seconds is taken
+    as complete right away, which covers AppBoxes found by the startup
+    scan. Otherwise the size is polled; the delay between checks starts at
+    `interval` and grows by half on every check, up to `max_interval`.
+
+    Args:
+        path: Path to the file to monitor.
+        timeout: Maximum time to wait in seconds (default: 90).
+        interval: Initial time between checks in seconds
+            (default: NX_APPHUBD_POLL_INTERVAL, or 0.5).
+        max_interval: Upper bound for the time between checks (default: 2.0).
+        quiet_period: Age in seconds after which an unmodified file needs
+            no polling (default: 5.0).
+
+    Returns:
+        True if file is ready and accessible, False if timeout occurs.
+    """
+    try:
+        st = os.stat(path)
+        if time.time() - st.st_mtime >= quiet_period and st.st_mode & stat.S_IRUSR:
+            return True
+    except OSError:
+        pass
+
+    delay = poll_interval if interval is None else interval
+    deadline = time.monotonic() + timeout
+    last_size = -1
+
+    while time.monotonic() < deadline:
+        try:
+            st = os.stat(path)
+            if st.st_size == last_size and st.st_mode & stat.S_IRUSR:
+                return True
+            last_size = st.st_size
+        except (FileNotFoundError, PermissionError):
+            pass
+        time.sleep(delay)
+        delay = min(delay * 1.5, max_interval)
+
+    return False
+
+
+def get_squashfs_offset(appbox_path: Path) -> int | None:
+    """
+    Compute the offset of the squashfs image embedded in an AppBox.
+
+    The AppImage runtime is an ELF binary with the squashfs image appended
+    right after it, so the offset is the end of the ELF section header table.
+
+    Args:
+        appbox_path: Path to the AppBox file.
+
+    Returns:
+        The byte offset of the squashfs image, or None if it cannot be found.
+    """
+    try:
+        with open(appbox_path, "rb") as f:
+            header = f.read(64)
+            if len(header) < 52 or header[:4] != b'\x7fELF':
+                return None
+
+            byteorder = "little" if header[5] == 1 else "big"
+
+            if header[4] == 2:
+                shoff = int.from_bytes(header[40:48], byteorder)
+                shentsize = int.from_bytes(header[58:60], byteorder)
+                shnum = int.from_bytes(header[60:62], byteorder)
+            else:
+                shoff = int.from_bytes(header[32:36], byteorder)
+                shentsize = int.from_bytes(header[46:48], byteorder)
+                shnum = int.from_bytes(header[48:50], byteorder)
+
+            offset = shoff + shentsize * shnum
+
+            f.seek(offset)
+            if f.read(4) != b'hsqs':
+                return None
+
+            return offset
+    except OSError as e:
+        log.error("Failed to read ELF header of %s: %s", appbox_path, e)
+        return None
+
+
+def extract_files(appbox_path: Path, offset: int, squashfs_root: Path, patterns: list[str]) -> bool:
+    """
+    Extract only the given paths from the squashfs image of an AppBox.
+
+    Uses unsquashfs to read the embedded image directly instead of running
+    the AppBox, so only the requested files are decompressed. Symlinks that
+    point elsewhere inside the image are followed and their targets extracted.
+
+    Args:
+        appbox_path: Path to the AppBox file.
+        offset: Byte offset of the squashfs image inside the AppBox.
+        squashfs_root: Destination directory for the extracted files.
+        patterns: Paths or wildcard patterns relative to the image root.
+
+    Returns:
+        True if unsquashfs ran successfully, False otherwise.
+    """
+    if not unsquashfs:
+        return False
+
+    for _ in range(4):
+        try:
+            result = subprocess.run(
+                [unsquashfs, "-o", str(offset), "-d", str(squashfs_root), "-f", "-no-progress",
+                 str(appbox_path), *patterns],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False
+            )
+        except OSError as e:
+            log.error("Failed to run unsquashfs for %s: %s", appbox_path, e)
+            return False
+
+        if result.returncode != 0:
+            log.debug("unsquashfs exited with %s for %s", result.returncode, appbox_path)
+            return False
+
+        patterns = _dangling_link_targets(squashfs_root)
+        if not patterns:
+            break
+
+    return True
+
+
+def _dangling_link_targets(squashfs_root: Path) -> list[str]:
+    """
+    Collect the targets of top-level symlinks that were extracted without them.
+
+    Args:
+        squashfs_root: Root of the partially extracted AppBox filesystem.
+
+    Returns:
+        Target paths relative to squashfs_root that still need extracting.
+    """
+    targets = []
+
+    try:
+        with os.scandir(squashfs_root) as it:
+            for entry in it:
+                if not entry.is_symlink() or os.path.exists(entry.path):
+                    continue
+
+                target = os.path.normpath(os.path.join(squashfs_root, os.readlink(entry.path)))
+                relative = os.path.relpath(target, squashfs_root)
+                if not relative.startswith(".."):
+                    targets.append(relative)
+    except OSError:
+        pass
+
+    return targets
+
+
+def extract_appbox(appbox_path: Path, workdir: Path) -> bool:
+    """
+    Fully extract an AppBox by running it with --appimage-extract.
+
+    Args:
+        appbox_path: Path to the AppBox file.
+        workdir: Directory in which squashfs-root is created.
+
+    Returns:
+        True if the extraction succeeded, False otherwise.
+    """
+    max_retries = 5
+
+    for attempt in range(max_retries):
+        try:
+            subprocess.run(
+                [str(appbox_path), "--appimage-extract"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=True,
+                cwd=workdir
+            )
+            return True
+        except OSError as e:
+            if e.errno == errno.ETXTBSY:
+                # The writer usually lets go within milliseconds, so start
+                # short and back off, with jitter against lockstep retries.
+                delay = min(0.1 * 2 ** attempt, 2.0) + random.uniform(0, 0.1)
+                log.warning(
+                    "File %s is busy (ETXTBSY), retrying extraction in %.2fs (Attempt %s/%s)...",
+                    appbox_path.name, delay, attempt + 1, max_retries
+                )
+                time.sleep(delay)
+            else:
+                log.error("OSError during extraction of %s: %s", appbox_path, e)
+                break
+        except subprocess.CalledProcessError as e:
+            log.error("Extraction command failed for %s: %s", appbox_path, e)
+            break
+
+    return False
+
+
+def list_files(directory: Path, suffix: str) -> list[os.DirEntry]:
+    """
+    List the files in a directory whose names end with a suffix.
+
+    Uses os.scandir, so the file type comes from the directory entry and
+    no extra stat is needed for files that are not symlinks.
+
+    Args:
+        directory: Directory to list.
+        suffix: File name suffix to match (e.g. ".desktop").
+
+    Returns:
+        The matching directory entries; empty if the directory is missing.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return [entry for entry in it if entry.name.endswith(suffix) and entry.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def _scan_tree(root: Path, match, max_depth: int) -> Path | None:
+    """
+    Breadth-first search of a directory tree using os.scandir.
+
+    Args:
+        root: Directory to start the search from.
+        match: Callable taking a file name and returning True on a hit.
+        max_depth: Maximum directory depth to descend into (0 = root only).
+
+    Returns:
+        Path to the first matching file, or None if nothing matched.
+    """
+    level = [str(root)]
+
+    for _ in range(max_depth + 1):
+        next_level = []
+        for directory in level:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            next_level.append(entry.path)
+                        elif match(entry.name) and entry.is_file():
+                            return Path(entry.path)
+            except OSError:
+                continue
+        if not next_level:
+            break
+        level = next_level
+
+    return None
+
+
+def find_desktop_file(squashfs_root: Path) -> Path | None:
+    """
+    Locate the desktop file of an extracted AppBox.
+
+    AppImages place the application desktop file at the top of squashfs-root,
+    so only a shallow search is performed.
+
+    Args:
+        squashfs_root: Root of the extracted AppBox filesystem.
+
+    Returns:
+        Path to the desktop file, or None if none was found.
+    """
+    return _scan_tree(squashfs_root, lambda name: name.endswith(".desktop"), max_depth=2)
+
+
+def find_icon_file(squashfs_root: Path, icon_name: str) -> Path | None:
+    """
+    Locate the icon referenced by the desktop file of an extracted AppBox.
+
+    The icon is resolved from the Icon= value by probing the top of
+    squashfs-root and the usual icon directories directly, falling back to
+    a bounded search. An Icon= value that is a path rather than a plain
+    icon name is not probed, since it could point outside squashfs-root.
+
+    Args:
+        squashfs_root: Root of the extracted AppBox filesystem.
+        icon_name: Value of the Icon= key in the desktop file.
+
+    Returns:
+        Path to the icon file, or None if none was found.
+    """
+    def is_image(name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in icon_suffix_set
+
+    if icon_name and "/" not in icon_name:
+        for icon_dir in icon_probe_dirs:
+            for suffix in icon_suffixes:
+                candidate = squashfs_root / icon_dir / f"{icon_name}{suffix}"
+                if candidate.is_file():
+                    return candidate
+
+        icon_prefix = f"{icon_name}."
+        icon_file = _scan_tree(
+            squashfs_root,
+            lambda name: name.startswith(icon_prefix) and is_image(name),
+            max_depth=6
+        )
+        if icon_file:
+            return icon_file
+
+    return _scan_tree(squashfs_root, is_image, max_depth=6)
+
+
+def drop_page_cache(path: Path):
+    """
+    Advise the kernel to drop cached pages of a file that was read in bulk.
+
+    Extraction reads large parts of the AppBox once; without this hint
+    those pages would evict the user's working set from the page cache.
+
+    Args:
+        path: File whose cached pages are no longer needed.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as e:
+        log.debug("posix_fadvise failed for %s: %s", path, e)
+    finally:
+        os.close(fd)
+
+
+def discard_directory(path: Path):
+    """
+    Remove a directory tree without blocking the caller.
+
+    The directory is renamed into a trash directory under extract_dir, which
+    takes a single syscall, and then deleted by a background thread.
+
+    Args:
+        path: Directory to remove.
+    """
+    trash = extract_dir / f".trash-{os.getpid()}-{next(trash_counter)}"
+
+    try:
+        os.rename(path, trash)
+    except FileNotFoundError:
+        return
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+
+    threading.Thread(
+        target=shutil.rmtree,
+        args=(trash,),
+        kwargs={"ignore_errors": True},
+        name="Cleaner",
+        daemon=True
+    ).start()
+
+
+def copy_file(src: Path, dst: Path):
+    """
+    Copy a file using copy_file_range, falling back to shutil.copyfile.
+
+    copy_file_range lets the kernel copy the data without moving it through
+    user space, and turns the copy into a reflink on filesystems such as
+    btrfs and XFS.
+
+    Args:
+        src: Source file.
+        dst: Destination file, overwritten if it exists.
+    """
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except (OSError, AttributeError):
+        shutil.copyfile(src, dst)
+
+
+def link_file(src: Path, dst: Path):
+    """
+    Hard-link a file into place, copying it when linking is not possible.
+
+    The extracted file lives in a work directory that is discarded
+    afterwards, so linking moves no data at all; the inode simply outlives
+    the work directory. Linking fails across filesystems, in which case
+    the file is copied.
+
+    Args:
+        src: Source file.
+        dst: Destination file, replaced if it exists.
+    """
+    try:
+        dst.unlink(missing_ok=True)
+        os.link(src, dst)
+    except OSError:
+        copy_file(src, dst)
+
+
+def install_icon(appbox_path: Path, squashfs_root: Path, squashfs_offset: int | None,
+                 icon_name: str, sanitized_name: str) -> Path | None:
+    """
+    Find the icon of an extracted AppBox and install it into icons_dir.
+
+    Args:
+        appbox_path: Path to the AppBox file.
+        squashfs_root: Root of the extracted AppBox filesystem.
+        squashfs_offset: Offset of the squashfs image when only selected files
+            were extracted, in which case the icon is extracted first; None if
+            the AppBox was fully extracted.
+        icon_name: Value of the Icon= key in the desktop file.
+        sanitized_name: Sanitized application name used for the icon file.
+
+    Returns:
+        Path to the installed icon, or None if no icon was found.
+    """
+    if squashfs_offset is not None:
+        if icon_name and "/" not in icon_name:
+            icon_patterns = [
+                f"{icon_name}.*",
+                f"usr/share/icons/hicolor/*/apps/{icon_name}.*",
+                f"usr/share/pixmaps/{icon_name}.*",
+            ]
+        else:
+            icon_patterns = ["*.png", "*.svg", "*.xpm"]
+        extract_files(appbox_path, squashfs_offset, squashfs_root, icon_patterns)
+
+    icon_file = find_icon_file(squashfs_root, icon_name)
+    if not icon_file:
+        return None
+
+    icon_dest = icons_dir / f"{sanitized_name}{icon_file.suffix}"
+    icons_dir.mkdir(parents=True, exist_ok=True)
+    link_file(icon_file, icon_dest)
+
+    return icon_dest
+
+
+def read_desktop_entry(lines, wanted=None) -> dict[bytes, bytes]:
+    """
+    Parse the [Desktop Entry] group of a desktop file in a single pass.
+
+    Parsing stops at the group following [Desktop Entry], or as soon as all
+    wanted keys have been seen, so a file object passed as lines is only read
+    as far as needed. For repeated keys the first value wins, as it does for
+    desktop environments.
+
+    Args:
+        lines: Iterable of the raw lines of the desktop file.
+        wanted: Optional collection of keys to stop after.
+
+    Returns:
+        The [Desktop Entry] keys and their stripped values; empty if the file
+        has no such group.
+    """
+    keys = {}
+    missing = set(wanted) if wanted else None
+    in_entry = False
+
+    for line in lines:
+        match = desktop_line_re.match(line)
+        if match is None:
+            continue
+
+        group = match.group("group")
+        if group is not None:
+            if in_entry:
+                break
+            in_entry = group == b"Desktop Entry"
+        elif in_entry:
+            key = match.group("key")
+            keys.setdefault(key, match.group("value").strip())
+            if missing is not None:
+                missing.discard(key)
+                if not missing:
+                    break
+
+    return keys
+
+
+def read_exec_icon(path: Path) -> tuple[bytes, bytes]:
+    """
+    Read the Exec= and Icon= values of a desktop file.
+
+    Results are memoized on the file's path and mtime, so the startup
+    clean-up and later removals do not re-read unchanged entries.
+
+    Args:
+        path: Path to the desktop file.
+
+    Returns:
+        The Exec= and Icon= values of [Desktop Entry], empty when missing.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    return _read_exec_icon(str(path), os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=256)
+def _read_exec_icon(path: str, _mtime_ns: int) -> tuple[bytes, bytes]:
+    """
+    Read the Exec= and Icon= values of a desktop file, memoized.
+
+    Args:
+        path: Path to the desktop file.
+        _mtime_ns: mtime of the file; only part of the cache key, so an
+            edited file is read again.
+
+    Returns:
+        The Exec= and Icon= values of [Desktop Entry], empty when missing.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, "rb") as f:
+        keys = read_desktop_entry(f, wanted=(b"Exec", b"Icon"))
+
+    return keys.get(b"Exec", b""), keys.get(b"Icon", b"")
+
+
+def _append_missing_keys(out, keys: dict, pending: dict, resolve_icon, last_line: bytes):
+    """
+    Append the keys that were not present at the end of [Desktop Entry].
+
+    Args:
+        out: Binary file object being written.
+        keys: Keys seen in the [Desktop Entry] group.
+        pending: Keys from the updates that have not been written yet.
+        resolve_icon: Callable mapping the original Icon= value to a new one.
+        last_line: Last line written, to terminate it if needed.
+    """
+    if b"Icon" not in keys:
+        icon_value = resolve_icon(b"")
+        if icon_value:
+            pending[b"Icon"] = icon_value
+
+    if pending and not last_line.endswith(b"\n"):
+        out.write(b"\n")
+
+    for key, value in pending.items():
+        out.write(key + b"=" + value + b"\n")
+
+    pending.clear()
+
+
+def write_desktop_entry(data: bytes, dest: Path, updates: dict[bytes, bytes],
+                        resolve_icon) -> dict[bytes, bytes] | None:
+    """
+    Rewrite a desktop file into dest in a single pass over its lines.
+
+    Within the [Desktop Entry] group, keys listed in updates are replaced and
+    the Icon= value is passed to resolve_icon, which returns the replacement
+    value or None to keep the line. Missing keys, including Icon= when the
+    resolver finds an icon, are appended at the end of the group. Comments,
+    other groups and the original formatting are kept.
+
+    Args:
+        data: Raw contents of the source desktop file.
+        dest: Path of the desktop file to write.
+        updates: Keys to set in [Desktop Entry] and their new values.
+        resolve_icon: Callable mapping the original Icon= value to a new one.
+
+    Returns:
+        The original values of the [Desktop Entry] keys, or None if the file
+        has no [Desktop Entry] group, in which case nothing is written.
+    """
+    if b"[Desktop Entry]" not in data:
+        return None
+
+    keys = {}
+    pending = dict(updates)
+    held = []
+    last_line = b"\n"
+    in_entry = found = done = False
+
+    # Written next to dest and moved into place, so a desktop entry is never
+    # seen half-written by the desktop environment or the next startup. The
+    # temporary name is unique, since the same entry can be written by two
+    # integrations of one AppBox at once.
+    fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.")
+    tmp_dest = Path(tmp_name)
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            os.fchmod(out.fileno(), 0o644)
+            for line in data.splitlines(keepends=True):
+                match = None if done else desktop_line_re.match(line)
+
+                if match is not None and match.group("group") is not None:
+                    if in_entry:
+                        _append_missing_keys(out, keys, pending, resolve_icon, last_line)
+                        in_entry, done = False, True
+                    elif match.group("group") == b"Desktop Entry":
+                        in_entry = found = True
+                elif in_entry:
+                    if match is None:
+                        # Blank lines and comments closing the group stay after appended keys.
+                        held.append(line)
+                        continue
+
+                    key = match.group("key")
+                    value = match.group("value").strip()
+                    keys.setdefault(key, value)
+
+                    if key in pending:
+                        line = key + b"=" + pending.pop(key) + b"\n"
+                    elif key == b"Icon":
+                        icon_value = resolve_icon(value)
+                        if icon_value:
+                            line = key + b"=" + icon_value + b"\n"
+
+                out.writelines(held)
+                held.clear()
+                out.write(line)
+                last_line = line
+
+            if in_entry:
+                _append_missing_keys(out, keys, pending, resolve_icon, last_line)
+            out.writelines(held)
+    except BaseException:
+        tmp_dest.unlink(missing_ok=True)
+        raise
+
+    if not found:
+        tmp_dest.unlink()
+        return None
+
+    os.replace(tmp_dest, dest)
+
+    return keys
+
+
+def integrate_appbox(appbox_path: Path, wait_ready=True, silent=False) -> str | None:
+    """
+    Main integration logic for AppBox files. Designed to run in a separate thread.
+
+    Extracts the AppBox, parses the desktop file, installs icons, and creates
+    desktop integration. Handles CLI applications by creating shell aliases.
+
+    Args:
+        appbox_path: Path to the AppBox file to integrate.
+        wait_ready: Poll until the file stops changing before integrating.
+            Callers that already know the writer is done (a close or move
+            event) pass False; NX_APPHUBD_FORCE_POLL overrides this.
+        silent: Do not send the "Application Installed" notification; the
+            caller reports the integration itself.
+
+    Returns:
+        The sanitized application name if the AppBox was integrated,
+        None otherwise.
+    """
+    if is_cached_integration(appbox_path):
+        log.info("AppBox %s is unchanged since its last integration", appbox_path.name)
+        return None
+
+    # Checked before any waiting or validation, so re-scans of an integrated
+    # AppBox return after a single stat.
+    raw_base_name = get_base_app_name(appbox_path.stem)
+    sanitized_name = sanitize_name(raw_base_name)
+
+    if os.path.exists(f"{apps_dir_str}/{sanitized_name}.desktop"):
+        log.info("AppBox %s already integrated as %s.desktop", appbox_path.name, sanitized_name)
+        return None
+
+    desktop_file_path = apps_dir / f"{sanitized_name}.desktop"
+
+    if (wait_ready or force_ready_poll) and not wait_until_file_ready(appbox_path):
+        log.warning("AppBox not ready after timeout: %s", appbox_path)
+        return None
+
+    is_valid, validation_reason = is_valid_appbox(appbox_path)
+    if not is_valid:
+        log.error(
+            "AppBox validation failed for %s: %s. "
+            "Skipping integration.",
+            appbox_path.name,
+            validation_reason
+        )
+        send_notification(
+            "Integration Failed",
+            f"{appbox_path.name} could not be integrated. {validation_reason}."
+        )
+        return None
+
+    if not os.access(appbox_path, os.X_OK):
+        log.warning("%s is not executable; setting mode 755", appbox_path.name)
+        appbox_path.chmod(0o755)
+
+    # Recreated in case it was removed while the daemon runs (e.g. by a cache cleaner).
+    extract_dir.mkdir(parents=True, exist_ok=True)
+
+    # A private work directory per run, so concurrent integrations of the
+    # same AppBox (an event racing the startup scan) cannot collide.
+    specific_extract_dir = Path(tempfile.mkdtemp(prefix=f".work-{sanitized_name}-", dir=extract_dir))
+
+    log.info("Extracting %s...", appbox_path.name)
+
+    squashfs_root = specific_extract_dir / "squashfs-root"
+
+    squashfs_offset = get_squashfs_offset(appbox_path)
+    targeted = squashfs_offset is not None and extract_files(
+        appbox_path, squashfs_offset, squashfs_root, ["*.desktop"]
+    )
+
+    extracted_desktop_file = find_desktop_file(squashfs_root) if targeted else None
+
+    if not extracted_desktop_file:
+        if targeted:
+            log.info("Targeted extraction found no desktop file in %s, extracting fully", appbox_path.name)
+            discard_directory(squashfs_root)
+            targeted = False
+
+        if not extract_appbox(appbox_path, specific_extract_dir):
+            log.error("Failed to extract %s after retries.", appbox_path)
+            discard_directory(specific_extract_dir)
+            return None
+
+        extracted_desktop_file = find_desktop_file(squashfs_root)
+
+    if not extracted_desktop_file:
+        log.warning("No desktop file found in %s", appbox_path)
+        discard_directory(specific_extract_dir)
+        return None
+
+    try:
+        desktop_data = extracted_desktop_file.read_bytes()
+    except OSError as e:
+        log.error("Error reading desktop file for %s: %s", appbox_path, e)
+        discard_directory(specific_extract_dir)
+        return None
+
+    installed_icons = []
+
+    def resolve_icon(icon_name: bytes) -> bytes | None:
+        icon_dest = install_icon(
+            appbox_path, squashfs_root, squashfs_offset if targeted else None,
+            icon_name.decode("utf-8", errors="replace"), sanitized_name
+        )
+        if not icon_dest:
+            return None
+        installed_icons.append(icon_dest)
+        return os.fsencode(icon_dest)
+
+    updates = {
+        b"Exec": os.fsencode(appbox_path),
+        b"TryExec": os.fsencode(appbox_path),
+    }
+
+    apps_dir.mkdir(parents=True, exist_ok=True)
+    desktop_keys = write_desktop_entry(desktop_data, desktop_file_path, updates, resolve_icon)
+
+    # Nothing else is read from the AppBox, keep its pages out of the page cache.
+    drop_page_cache(appbox_path)
+
+    if desktop_keys is None:
+        log.warning("Invalid desktop file (no [Desktop Entry]): %s", extracted_desktop_file)
+        discard_directory(specific_extract_dir)
+        return None
+
+    icon_dest = installed_icons[0] if installed_icons else None
+    is_cli_app = desktop_keys.get(b"NoDisplay", b"false").lower() == b"true"
+
+    log.info("Integrated %s as %s", appbox_path.name, desktop_file_path.name)
+
+    record_integration(appbox_path, desktop_file_path, icon_dest, is_cli_app)
+
+    if not silent:
+        send_notification(
+            "Application Installed",
+            f"{display_name(sanitized_name)} has been successfully integrated with the system.",
+            icon=icon_dest
+        )
+
+    if is_cli_app:
+        update_alias_file(sanitized_name, appbox_path, remove=False)
+
+    discard_directory(specific_extract_dir)
+
+    return sanitized_name
+
+
+def submit_integration(appbox_path: Path, wait_ready=True, silent=False) -> Future | None:
+    """
+    Queue an AppBox for integration on the integrator pool.
+
+    Args:
+        appbox_path: Path to the AppBox file to integrate.
+        wait_ready: Passed on to integrate_appbox.
+        silent: Passed on to integrate_appbox.
+
+    Returns:
+        The future of the integration, or None if the pool is shut down.
+    """
+    def report(future):
+        if not future.cancelled() and future.exception() is not None:
+            log.error("Integration of %s failed: %s", appbox_path, future.exception())
+
+    try:
+        future = integrator_pool.submit(integrate_appbox, appbox_path, wait_ready, silent)
+    except RuntimeError:
+        log.info("Not integrating %s, the daemon is shutting down", appbox_path.name)
+        return None
+
+    future.add_done_callback(report)
+    return future
+
+
+def remove_icons(name: str):
+    """
+    Remove every icon installed under a given application name.
+
+    Icons are installed as icons_dir/<name><suffix>, so a single scandir pass
+    comparing each file's stem finds them without compiling a glob pattern.
+
+    Args:
+        name: Sanitized application name.
+    """
+    try:
+        with os.scandir(icons_dir) as it:
+            for entry in it:
+                if os.path.splitext(entry.name)[0] == name and entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
+                    log.info("Removed icon %s", entry.name)
+    except OSError as e:
+        log.error("Failed to sweep icons for %s: %s", name, e)
+
+
+def remove_cached_files(entry: dict) -> bool:
+    """
+    Remove the desktop file and icons recorded in an integration cache entry.
+
+    Args:
+        entry: Integration cache entry of an AppBox.
+
+    Returns:
+        True if the desktop file was removed, False otherwise.
+    """
+    removed = False
+    desktop_file = Path(entry["desktop"])
+
+    try:
+        desktop_file.unlink()
+        log.info("Removed desktop entry %s", desktop_file.name)
+        removed = True
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log.error("Failed to remove desktop entry %s: %s", desktop_file, e)
+
+    for icon_path_str in entry.get("icons", []):
+        icon_path = Path(icon_path_str)
+        if icons_dir in icon_path.parents:
+            try:
+                icon_path.unlink()
+                log.info("Removed icon %s", icon_path.name)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log.error("Failed to remove icon %s: %s", icon_path, e)
+
+    return removed
 
 
 def remove_integration(appbox_path: Path):
@@ -496,141 +1722,405 @@ def remove_integration(appbox_path: Path):
     appbox_name = sanitize_name(get_base_app_name(appbox_path.stem))
     removed_anything = False
 
-    for file in apps_dir.glob("*.desktop"):
-        try:
-            if appbox_name in file.name: 
-                parser = configparser.ConfigParser()
-                parser.optionxform = str
-                parser.read(file)
-
-                if 'Desktop Entry' in parser:
-                    exec_path = parser['Desktop Entry'].get('Exec', '')
-                    if str(appbox_path) in exec_path:
+    entry = forget_integration(appbox_path)
+
+    if entry:
+        removed_anything = remove_cached_files(entry)
+    else:
+        # Integrations made before the cache existed are found by scanning apps_dir.
+        for desktop_entry in list_files(apps_dir, ".desktop"):
+            file = Path(desktop_entry.path)
+            try:
+                if appbox_name in file.name: 
+                    exec_value, icon_value = read_exec_icon(file)
+                    if os.fsencode(appbox_path) in exec_value:
                         file.unlink()
-                        logging.info(f"Removed desktop entry {file.name}")
+                        log.info("Removed desktop entry %s", file.name)
                         removed_anything = True
 
-                        icon_path_str = parser['Desktop Entry'].get('Icon', '')
+                        icon_path_str = os.fsdecode(icon_value)
                         if icon_path_str:
                             icon_path = Path(icon_path_str)
                             if icon_path.exists() and icons_dir in icon_path.parents:
                                 icon_path.unlink()
-                                logging.info(f"Removed icon {icon_path.name}")
-        except Exception as e:
-            logging.error(f"Failed to process removal for {file}: {e}")
+                                log.info("Removed icon %s", icon_path.name)
+            except Exception as e:
+                log.error("Failed to process removal for %s: %s", file, e)
+
+        if removed_anything:
+            remove_icons(appbox_name)
 
     if removed_anything:
-        update_alias_file(appbox_name, appbox_path, remove=True)
+        # Entries recorded without an alias need no pass over the alias file.
+        if not entry or entry.get("cli") is not False:
+            update_alias_file(appbox_name, appbox_path, remove=True)
         send_notification(
             "Application Removed",
-            f"Integration for {appbox_name.title()} has been removed from the system."
+            f"Integration for {display_name(appbox_name)} has been removed from the system."
     )
 
 
-class AppBoxHandler(FileSystemEventHandler):
+class AppBoxHandler(PatternMatchingEventHandler):
     """Handle creation and deletion events for AppBox files.
 
     This class watches the configured directory for `.AppBox` files.
-    When a file is created, it triggers integration in a background thread.
-    When a file is deleted, it removes the corresponding integration.
+    Events are queued and coalesced per path by a debounce thread. A file
+    that was closed after writing or moved into the directory is integrated
+    once it has been idle for `debounce_delay` seconds; a file that was only
+    created is additionally required to stop changing size. Settled files
+    are integrated on the shared integrator pool, so a burst of new
+    AppBoxes is processed a few at a time. When a file is deleted or moved
+    away, the corresponding integration is removed.
     """
 
+    event_filter = [FileCreatedEvent, FileDeletedEvent, FileMovedEvent, FileClosedEvent]
+
+    debounce_delay = 0.5
+    settle_interval = poll_interval
+
+    def __init__(self):
+        super().__init__(patterns=[f"*{appbox_suffix}"], ignore_directories=True, case_sensitive=True)
+        self._events = queue.Queue()
+        self._pending = {}
+        self._debouncer = threading.Thread(target=self._process_events, name="Debouncer", daemon=True)
+        self._debouncer.start()
+
     def on_created(self, event):
-        if event.is_directory or not event.src_path.endswith(".AppBox"):
-            return
+        self._events.put((Path(event.src_path), "created", time.monotonic()))
 
-        appbox_path = Path(event.src_path)
+    def on_closed(self, event):
+        self._events.put((Path(event.src_path), "ready", time.monotonic()))
 
-        t = threading.Thread(
-            target=integrate_appbox, 
-            args=(appbox_path,), 
-            name=f"Integrator-{appbox_path.name}"
-        )
-        t.start()
+    def on_moved(self, event):
+        # Dispatched when either side matches; only act on the side that does.
+        if event.src_path[appbox_suffix_start:] == appbox_suffix:
+            self._events.put((Path(event.src_path), "deleted", time.monotonic()))
+
+        if event.dest_path[appbox_suffix_start:] == appbox_suffix:
+            self._events.put((Path(event.dest_path), "ready", time.monotonic()))
 
     def on_deleted(self, event):
-        if event.is_directory or not event.src_path.endswith(".AppBox"):
-            return
+        self._events.put((Path(event.src_path), "deleted", time.monotonic()))
+
+    def _process_events(self):
+        """
+        Coalesce queued events and dispatch them once they have settled.
+        """
+        while True:
+            timeout = None
+            if self._pending:
+                next_deadline = min(entry[1] for entry in self._pending.values())
+                timeout = max(0.0, next_deadline - time.monotonic())
+
+            try:
+                appbox_path, action, timestamp = self._events.get(timeout=timeout)
+                pending = self._pending.get(appbox_path)
+
+                # A deletion followed by a re-creation must still remove the old integration.
+                if pending and pending[0] == "deleted" and action != "deleted":
+                    remove_integration(appbox_path)
 
-        remove_integration(Path(event.src_path))
+                self._pending[appbox_path] = [action, timestamp + self.debounce_delay, -1]
+            except queue.Empty:
+                pass
 
+            now = time.monotonic()
+
+            for appbox_path, entry in list(self._pending.items()):
+                action, deadline, last_size = entry
+                if deadline > now:
+                    continue
+
+                if action == "deleted":
+                    del self._pending[appbox_path]
+                    remove_integration(appbox_path)
+                    continue
+
+                if action == "ready":
+                    del self._pending[appbox_path]
+                    self._dispatch(appbox_path)
+                    continue
+
+                try:
+                    current_size = appbox_path.stat().st_size
+                except FileNotFoundError:
+                    del self._pending[appbox_path]
+                    continue
+                except OSError:
+                    current_size = -1
 
-def clean_stale_integrations():
+                if current_size != last_size:
+                    entry[1] = now + self.settle_interval
+                    entry[2] = current_size
+                    continue
+
+                del self._pending[appbox_path]
+                self._dispatch(appbox_path)
+
+    @staticmethod
+    def _dispatch(appbox_path: Path):
+        """
+        Queue a settled AppBox for integration.
+
+        The debouncer only dispatches files that were closed, moved in, or
+        have stopped changing size, so the readiness poll is skipped.
+        """
+        submit_integration(appbox_path, wait_ready=False)
+
+
+def _clean_legacy_desktop_entries(existing_appboxes: set[str], indexed: set[str], indexed_desktops: set[str]):
     """
-    Remove stale desktop entries, icons, and aliases if the AppBox is missing.
+    Remove or index the desktop entries the integration cache does not know.
+
+    Entries written before the integration cache existed are indexed here,
+    so removing their AppBox later does not need to scan apps_dir; those
+    whose AppBox is gone are removed. The Exec= and Icon= values of the
+    other entries are remembered in desktop-exec.json, so unchanged ones
+    are not read again on the next start.
 
-    Scans all desktop entries and aliases, removing those that reference
-    non-existent AppBox files in the watched directory.
+    Args:
+        existing_appboxes: Paths of the AppBoxes present in the watched directory.
+        indexed: AppBox paths recorded in the integration cache.
+        indexed_desktops: Desktop file paths recorded in the integration cache.
     """
-    existing_appboxes = {str(p) for p in watch_dir.glob("*.AppBox")}
+    adopted = {}
+    exec_cache = _load_desktop_exec_cache()
+    seen = {}
+
+    for desktop_entry in list_files(apps_dir, ".desktop"):
+        desktop_str = desktop_entry.path
+        if desktop_str in indexed_desktops:
+            continue
 
-    for desktop_file in apps_dir.glob("*.desktop"):
         try:
-            parser = configparser.ConfigParser()
-            parser.optionxform = str
-            parser.read(desktop_file)
-
-            if 'Desktop Entry' in parser:
-                exec_cmd = parser['Desktop Entry'].get('Exec', '').strip("'\"")
-                if str(watch_dir) in exec_cmd:
-                    possible_path = exec_cmd.split()[0].strip("'\"")
-                    if possible_path not in existing_appboxes:
-                        desktop_file.unlink()
-                        logging.info(f"Removed stale desktop entry {desktop_file.name}")
+            st = desktop_entry.stat()
+            cached = exec_cache.get(desktop_str)
+
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                exec_cmd, icon_value = cached[2], cached[3]
+            else:
+                exec_value, icon_value = _read_exec_icon(desktop_str, st.st_mtime_ns)
+                exec_cmd = os.fsdecode(exec_value).strip("'\"")
+                icon_value = os.fsdecode(icon_value)
         except Exception:
-            pass
+            continue
 
-    if alias_file.exists():
-        with file_lock:
-            with open(alias_file, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
+        if not exec_cmd.startswith(watch_prefix):
+            seen[desktop_str] = [st.st_mtime_ns, st.st_size, exec_cmd, icon_value]
+            continue
 
-            new_lines = []
-            skip = False
-            modified = False
+        possible_path = exec_cmd.split()[0].strip("'\"")
+        if possible_path not in existing_appboxes:
+            try:
+                os.unlink(desktop_str)
+                log.info("Removed stale desktop entry %s", desktop_entry.name)
+            except OSError:
+                pass
+        elif possible_path not in indexed:
+            icon_path = Path(icon_value)
+            adopted[Path(possible_path)] = (
+                Path(desktop_str), icon_path if icons_dir in icon_path.parents else None, None
+            )
+        else:
+            seen[desktop_str] = [st.st_mtime_ns, st.st_size, exec_cmd, icon_value]
 
-            for i, line in enumerate(lines):
-                if skip:
-                    skip = False
-                    continue
+    record_integrations(adopted)
+
+    if seen != exec_cache:
+        _save_desktop_exec_cache(seen)
+
+
+def clean_stale_integrations(appboxes: list[Path] = None):
+    """
+    Remove stale desktop entries, icons, and aliases if the AppBox is missing.
+
+    Integrations recorded in the integration cache are checked against the
+    AppBoxes present in the watched directory; the remaining desktop entries
+    and the aliases are scanned for references to missing AppBox files.
+
+    Must be called at startup, before any integration or file event is
+    processed.
+
+    Args:
+        appboxes: AppBox files present in the watched directory; listed
+            if not given.
+    """
+    if appboxes is None:
+        appboxes = [Path(entry.path) for entry in list_files(watch_dir, appbox_suffix)]
+
+    existing_appboxes = {str(p) for p in appboxes}
+
+    # Integrations recorded in the cache are settled by a set difference
+    # against the AppBoxes present, without reading any desktop file.
+    with cache_lock:
+        cache = _load_integration_cache()
+        stale = {path: cache.pop(path) for path in list(cache) if path not in existing_appboxes}
+        if stale:
+            _save_integration_cache()
+        indexed = set(cache)
+        indexed_desktops = {entry["desktop"] for entry in cache.values()}
+
+    for path, entry in stale.items():
+        log.info("Removing stale integration of %s", Path(path).name)
+        remove_cached_files(entry)
 
-                if line.strip().startswith("# Alias for"):
-                    if i + 1 < len(lines) and "alias " in lines[i+1]:
-                        cmd_line = lines[i+1]
-                        match = re.search(r"='([^']+)'", cmd_line)
-                        if match:
-                            path_str = match.group(1)
-                            if str(watch_dir) in path_str and path_str not in existing_appboxes:
-                                logging.info(f"Removing stale alias from line {i+1}")
-                                modified = True
-                                skip = True
-                                continue
+    _clean_legacy_desktop_entries(existing_appboxes, indexed, indexed_desktops)
 
-                new_lines.append(line)
+    # Runs before the startup scan and the observer, so no other thread can
+    # be editing the alias file yet and file_lock is not taken.
+    lines = _load_alias_text().splitlines(keepends=True)
 
-            if modified:
-                with open(alias_file, "w", encoding="utf-8") as f:
-                    f.writelines(new_lines)
+    new_lines = []
+    skip = False
+    modified = False
 
+    for i, line in enumerate(lines):
+        if skip:
+            skip = False
+            continue
+
+        if line.strip().startswith("# Alias for"):
+            if i + 1 < len(lines) and "alias " in lines[i+1]:
+                cmd_line = lines[i+1]
+                match = alias_target_re.search(cmd_line)
+                if match:
+                    path_str = match.group(1)
+                    if path_str.startswith(watch_prefix) and path_str not in existing_appboxes:
+                        log.info("Removing stale alias from line %s", i + 1)
+                        modified = True
+                        skip = True
+                        continue
+
+        new_lines.append(line)
+
+    if modified:
+        _store_alias_text("".join(new_lines))
 
-def scan_existing_appboxes():
+
+def scan_existing_appboxes(appboxes: list[Path] = None):
     """
     Scan existing AppBoxes and integrate missing ones.
 
     Called at daemon startup to ensure all AppBox files in the watched
     directory are properly integrated with the desktop environment.
+    Integrations run concurrently on the integrator pool; each one uses
+    its own extraction directory, so they do not interfere. When several
+    AppBoxes are integrated, a single summary notification is sent once
+    all of them are done instead of one per application.
+
+    Args:
+        appboxes: AppBox files present in the watched directory; listed
+            if not given.
     """
-    for appbox in watch_dir.glob("*.AppBox"):
+    if appboxes is None:
+        appboxes = [Path(entry.path) for entry in list_files(watch_dir, appbox_suffix)]
+
+    unintegrated = []
+
+    for appbox in appboxes:
         base_name = sanitize_name(get_base_app_name(appbox.stem))
-        expected_desktop = apps_dir / f"{base_name}.desktop"
+        if not os.path.exists(f"{apps_dir_str}/{base_name}.desktop"):
+            log.info("Found unintegrated AppBox: %s, integrating...", appbox.name)
+            unintegrated.append(appbox)
+
+    if not unintegrated:
+        return
+
+    if len(unintegrated) == 1:
+        submit_integration(unintegrated[0])
+        return
+
+    futures = [submit_integration(appbox, silent=True) for appbox in unintegrated]
+    futures = [future for future in futures if future is not None]
+
+    threading.Thread(
+        target=notify_startup_integrations, args=(futures,), name="StartupSummary", daemon=True
+    ).start()
+
+
+def notify_startup_integrations(futures: list[Future]):
+    """
+    Send one notification for the AppBoxes integrated by the startup scan.
+
+    Args:
+        futures: Futures of the integrations queued by scan_existing_appboxes.
+    """
+    wait_futures(futures)
+
+    names = [
+        future.result() for future in futures
+        if not future.cancelled() and future.exception() is None and future.result()
+    ]
+
+    if len(names) == 1:
+        send_notification(
+            "Application Installed",
+            f"{display_name(names[0])} has been successfully integrated with the system."
+        )
+    elif names:
+        send_notification(
+            "Applications Installed",
+            f"{len(names)} applications have been successfully integrated with the system."
+        )
 
-        if not expected_desktop.exists():
-            logging.info(f"Found unintegrated AppBox: {appbox.name}, integrating...")
-            threading.Thread(
-                target=integrate_appbox,
-                args=(appbox,),
-                name=f"Integrator-{appbox.name}"
-            ).start()
+
+def get_filesystem_type(path: Path) -> str | None:
+    """
+    Look up the type of the filesystem a path lives on.
+
+    Args:
+        path: Path to look up.
+
+    Returns:
+        The filesystem type from /proc/self/mountinfo, or None if unknown.
+    """
+    target = os.path.realpath(path)
+    best_mount, best_type = "", None
+
+    try:
+        with open("/proc/self/mountinfo", "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields, _, rest = line.partition(" - ")
+                fields, rest = fields.split(), rest.split()
+                if len(fields) < 5 or not rest:
+                    continue
+
+                mount_point = mountinfo_escape_re.sub(lambda match: chr(int(match[1], 8)), fields[4])
+                if len(mount_point) < len(best_mount):
+                    continue
+
+                if target == mount_point or target.startswith(mount_point.rstrip("/") + "/"):
+                    best_mount, best_type = mount_point, rest[0]
+    except OSError as e:
+        log.warning("Failed to read mount table: %s", e)
+
+    return best_type
+
+
+def create_observer():
+    """
+    Create the file system observer for the watched directory.
+
+    inotify does not report changes made by other hosts on network
+    filesystems, nor reliably through overlay mounts, so a polling observer
+    is used there. Its interval is NX_APPHUBD_WATCH_INTERVAL (default: 30 s).
+
+    Returns:
+        A watchdog observer instance.
+    """
+    fs_type = get_filesystem_type(watch_dir)
+
+    if fs_type in polled_filesystems:
+        try:
+            interval = float(os.environ.get("NX_APPHUBD_WATCH_INTERVAL", 30))
+        except ValueError:
+            interval = 30.0
+
+        log.info("Watching %s (%s) by polling every %ss", watch_dir, fs_type, interval)
+        return PollingObserver(timeout=interval)
+
+    log.info("Watching %s (%s) with inotify", watch_dir, fs_type or "unknown filesystem")
+    return Observer()
 
 
 def ensure_zsh_source():
@@ -638,7 +2128,9 @@ def ensure_zsh_source():
     Ensure the alias file is sourced in .zshrc.
 
     Adds a source line to the user's .zshrc file to load AppBox shell aliases.
-    Creates .zshrc if it doesn't exist.
+    Creates .zshrc if it doesn't exist. The mtime and size of a .zshrc known
+    to source the alias file are remembered, so an unchanged .zshrc is not
+    read again on later starts.
     """
     zshrc = home / ".zshrc"
 
@@ -649,23 +2141,29 @@ def ensure_zsh_source():
         source_line = f'source "{alias_file}"'
 
     try:
-        if not zshrc.exists():
-            zshrc.touch()
+        st = zshrc.stat()
+        if zshrc_marker_file.read_text(encoding="utf-8") == f"{st.st_mtime_ns} {st.st_size}":
+            return
+    except (OSError, ValueError):
+        pass
 
-        current_content = zshrc.read_text(encoding="utf-8", errors="ignore")
+    try:
+        with open(zshrc, "a+", encoding="utf-8", errors="ignore") as f:
+            f.seek(0)
+            current_content = f.read()
 
-        if source_line in current_content or str(alias_file) in current_content:
-            return
+            if source_line not in current_content and str(alias_file) not in current_content:
+                log.info("Adding source line to %s", zshrc)
 
-        logging.info(f"Adding source line to {zshrc}")
+                if current_content and not current_content.endswith("\n"):
+                    f.write("\n")
+                f.write(f"\n# Added by nx-apphubd\n{source_line}\n")
 
-        with open(zshrc, "a", encoding="utf-8") as f:
-            if current_content and not current_content.endswith("\n"):
-                f.write("\n")
-            f.write(f"\n# Added by nx-apphubd\n{source_line}\n")
+        st = zshrc.stat()
+        zshrc_marker_file.write_text(f"{st.st_mtime_ns} {st.st_size}", encoding="utf-8")
 
     except Exception as e:
-        logging.error(f"Failed to update .zshrc: {e}")
+        log.error("Failed to update .zshrc: %s", e)
 
 
 def main():
@@ -675,7 +2173,7 @@ def main():
     Initializes directories, cleans stale integrations, scans existing AppBoxes,
     sets up file system monitoring, and runs the daemon event loop.
     """
-    logging.info("Starting nx-apphubd")
+    log.info("Starting nx-apphubd")
 
     for path in [watch_dir, extract_dir, apps_dir, icons_dir, config_dir]:
         path.mkdir(parents=True, exist_ok=True)
@@ -683,26 +2181,43 @@ def main():
     if not alias_file.exists():
         alias_file.touch()
 
-    clean_stale_integrations()
-    scan_existing_appboxes()
+    # Work and trash directories left behind if a previous run exited mid-integration.
+    leftovers = [*extract_dir.glob(".work-*"), *extract_dir.glob(".trash-*")]
+    for leftover in leftovers:
+        discard_directory(leftover)
+
+    # Connect to the session bus up front, so the first notification does
+    # not pay for the handshake in an integration thread.
+    with notify_lock:
+        _get_notification_bus()
+
+    # The watched directory is listed once for both startup passes.
+    appboxes = [Path(entry.path) for entry in list_files(watch_dir, appbox_suffix)]
+
+    clean_stale_integrations(appboxes)
+    scan_existing_appboxes(appboxes)
     ensure_zsh_source()
 
     if alias_file.exists():
-        logging.info(f"IMPORTANT: Please source {alias_file} in your .zshrc to enable CLI aliases.")
+        log.info("IMPORTANT: Please source %s in your .zshrc to enable CLI aliases.", alias_file)
 
-    observer = Observer()
+    observer = create_observer()
     handler = AppBoxHandler()
-    observer.schedule(handler, str(watch_dir), recursive=False)
+    observer.schedule(handler, str(watch_dir), recursive=False, event_filter=handler.event_filter)
     observer.start()
 
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        observer.stop()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    stop_event.wait()
 
+    observer.stop()
     observer.join()
-    logging.info("Stopping nx-apphubd")
+
+    # Integrations still queued are picked up by the next startup scan.
+    integrator_pool.shutdown(wait=True, cancel_futures=True)
+    log.info("Stopping nx-apphubd")
 
 
 if __name__ == "__main__":
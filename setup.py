@@ -10,8 +10,9 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
-        "watchdog",
+        "watchdog>=4.0",
         "pyyaml",
+        "jeepney",
     ],
     entry_points={
         'console_scripts': [
@@ -24,5 +25,5 @@ setup(
         "Programming Language :: Python :: 3",
         "Operating System :: POSIX :: Linux",
     ],
-    python_requires='>=3.7',
+    python_requires='>=3.10',
 )